@@ -43,7 +43,14 @@ async function handleFileUpload(event, type) {
 
     try {
         const text = await file.text();
-        const data = jsyaml.load(text);
+        // Config files only use plain maps, lists and scalars, so parse
+        // with the core schema - js-yaml then skips resolution of its
+        // extended types (timestamps, binary, ...) on every node.
+        // filename puts the file name in parse-error messages.
+        const data = jsyaml.load(text, {
+            schema: jsyaml.CORE_SCHEMA,
+            filename: file.name,
+        });
 
         if (type === 'classroom') {
             classroomConfig = data;
@@ -76,6 +83,22 @@ async function handleFileUpload(event, type) {
     }
 }
 
+// Worker pool for off-thread generation (empty when unsupported)
+let seatingWorkers = [];
+
+function terminateWorkers() {
+    seatingWorkers.forEach(worker => worker.terminate());
+    seatingWorkers = [];
+}
+
+/**
+ * Workers need http(s); when the app is opened directly from disk
+ * (file://) generation falls back to running on the main thread.
+ */
+function workerSupported() {
+    return typeof Worker !== 'undefined' && window.location.protocol !== 'file:';
+}
+
 /**
  * Generate seating chart
  */
@@ -84,97 +107,171 @@ function generateSeatingChart() {
     showLoading();
     resultsSection.style.display = 'none';
 
-    // Small delay to show loading indicator
-    setTimeout(() => {
-        try {
-            // Create generator
-            generator = new SeatingChartGenerator(classroomConfig, studentsConfig);
+    // Construct on the main thread first so config errors surface
+    // immediately; generator is also needed for the stats display
+    try {
+        generator = new SeatingChartGenerator(classroomConfig, studentsConfig);
+    } catch (error) {
+        hideLoading();
+        showError(`Error generating seating chart: ${error.message}`);
+        return;
+    }
 
-            // Get seed if provided
-            const seed = seedInput.value ? parseInt(seedInput.value) : null;
-            currentSeed = seed;
+    // Get seed if provided
+    const seed = seedInput.value ? parseInt(seedInput.value) : null;
+    currentSeed = seed;
+
+    if (workerSupported()) {
+        // Run the search in Web Workers so the UI never freezes;
+        // terminating old workers cancels a still-running search.
+        // Attempts are independent trial-and-error, so unseeded runs
+        // race a small pool of workers and take the first success.
+        // Seeded runs stay on one worker so the result only depends on
+        // the seed, not on which core finishes first.
+        terminateWorkers();
+        const poolSize = seed !== null
+            ? 1
+            : Math.min(navigator.hardwareConcurrency || 2, 4);
+
+        let settled = false;
+        let pendingWorkers = poolSize;
+
+        for (let i = 0; i < poolSize; i++) {
+            const worker = new Worker('js/seating-worker.js');
+            worker.onmessage = (event) => {
+                if (settled) return;
+                if (event.data.error) {
+                    // Every attempt stream hit the same infeasible
+                    // constraints; report once after the last worker
+                    pendingWorkers--;
+                    if (pendingWorkers === 0) {
+                        settled = true;
+                        hideLoading();
+                        showError(`Error generating seating chart: ${event.data.error}`);
+                    }
+                } else {
+                    settled = true;
+                    terminateWorkers();
+                    showResults(event.data.seating);
+                }
+            };
+            worker.onerror = () => {
+                // Worker failed to load - fall back to the main thread
+                if (settled) return;
+                settled = true;
+                terminateWorkers();
+                generateOnMainThread(seed);
+            };
+            worker.postMessage({ classroomConfig, studentsConfig, seed });
+            seatingWorkers.push(worker);
+        }
+    } else {
+        // Small delay to show loading indicator
+        setTimeout(() => generateOnMainThread(seed), 100);
+    }
+}
 
-            // Generate seating chart
-            currentSeating = generator.generate(1000, seed);
+/**
+ * Synchronous fallback path when Web Workers are unavailable
+ */
+function generateOnMainThread(seed) {
+    try {
+        showResults(generator.generate(1000, seed));
+    } catch (error) {
+        hideLoading();
+        showError(`Error generating seating chart: ${error.message}`);
+    }
+}
 
-            // Display results
-            displaySeatingChart(currentSeating);
-            displayStats(currentSeating);
+/**
+ * Render a generated seating chart and reveal the results section
+ */
+function showResults(seating) {
+    currentSeating = seating;
 
-            // Show results
-            hideLoading();
-            resultsSection.style.display = 'block';
+    const occupiedDesks = displaySeatingChart(currentSeating);
+    displayStats(occupiedDesks);
 
-            // Scroll to results
-            resultsSection.scrollIntoView({ behavior: 'smooth', block: 'start' });
+    hideLoading();
+    resultsSection.style.display = 'block';
 
-        } catch (error) {
-            hideLoading();
-            showError(`Error generating seating chart: ${error.message}`);
-        }
-    }, 100);
+    // Scroll to results
+    resultsSection.scrollIntoView({ behavior: 'smooth', block: 'start' });
 }
 
+// Markup fragments used by displaySeatingChart. The cell strings are
+// invariant across cells and renders, so they are built once here
+// instead of being re-evaluated inside the render loop.
+const GRID_OPEN = '<div class="desk-grid">';
+const ROW_OPEN = '<div class="desk-row">';
+const DIV_CLOSE = '</div>';
+const BLOCKED_CELL = '<div class="desk-cell blocked">[X]</div>';
+const EMPTY_CELL = '<div class="desk-cell empty">[empty]</div>';
+const OCCUPIED_OPEN = '<div class="desk-cell occupied">';
+const NAME_OPEN = '<span class="student-name">';
+const NAME_CLOSE = '</span>';
+
 /**
- * Display seating chart as a grid
+ * Escape a string for safe interpolation into HTML markup
  */
-function displaySeatingChart(seating) {
-    seatingChart.innerHTML = '';
+function escapeHtml(text) {
+    return String(text)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;');
+}
 
-    const table = document.createElement('div');
-    table.className = 'desk-grid';
+/**
+ * Display seating chart as a grid. The markup is accumulated in an
+ * array and written with a single innerHTML assignment, so the browser
+ * parses and lays out the grid once instead of once per appended node.
+ * Student names are escaped before interpolation. Counts occupied desks
+ * during the same pass so displayStats doesn't need a second sweep
+ * over the grid; returns that count.
+ */
+function displaySeatingChart(seating) {
+    let occupiedDesks = 0;
 
-    for (let row = 0; row < seating.length; row++) {
-        const rowDiv = document.createElement('div');
-        rowDiv.className = 'desk-row';
+    const rows = seating.length;
+    const columns = rows > 0 ? seating[0].length : 0;
+    const parts = [GRID_OPEN];
 
-        for (let col = 0; col < seating[row].length; col++) {
-            const cell = document.createElement('div');
-            cell.className = 'desk-cell';
+    for (let row = 0; row < rows; row++) {
+        parts.push(ROW_OPEN);
 
+        for (let col = 0; col < columns; col++) {
             const desk = seating[row][col];
 
-            if (desk === 'BLOCKED') {
-                cell.classList.add('blocked');
-                cell.textContent = '[X]';
+            if (desk === null) {
+                parts.push(BLOCKED_CELL);
             } else if (Array.isArray(desk) && desk.length > 0) {
-                cell.classList.add('occupied');
+                occupiedDesks++;
+                parts.push(OCCUPIED_OPEN);
                 desk.forEach(studentName => {
-                    const studentSpan = document.createElement('span');
-                    studentSpan.className = 'student-name';
-                    studentSpan.textContent = studentName;
-                    cell.appendChild(studentSpan);
+                    parts.push(NAME_OPEN + escapeHtml(studentName) + NAME_CLOSE);
                 });
+                parts.push(DIV_CLOSE);
             } else {
-                cell.classList.add('empty');
-                cell.textContent = '[empty]';
+                parts.push(EMPTY_CELL);
             }
-
-            rowDiv.appendChild(cell);
         }
 
-        table.appendChild(rowDiv);
+        parts.push(DIV_CLOSE);
     }
 
-    seatingChart.appendChild(table);
+    parts.push(DIV_CLOSE);
+    seatingChart.innerHTML = parts.join('');
+    return occupiedDesks;
 }
 
 /**
  * Display statistics
  */
-function displayStats(seating) {
+function displayStats(occupiedDesks) {
     const totalStudents = generator.students.length;
     const totalDesks = generator.rows * generator.columns - generator.blockedDesks.size;
 
-    let occupiedDesks = 0;
-    for (const row of seating) {
-        for (const desk of row) {
-            if (Array.isArray(desk) && desk.length > 0) {
-                occupiedDesks++;
-            }
-        }
-    }
-
     let statsText = `Students: ${totalStudents} | Desks: ${occupiedDesks}/${totalDesks} occupied`;
 
     // Add seed if it was specified
@@ -38,6 +38,23 @@ class SeatingChartGenerator {
         this.cannotSitTogether = this.constraints.cannot_sit_together || [];
         this.largeStudents = new Set(this.constraints.large_students || []);
 
+        // Flatten the groups into a per-student set of forbidden partners,
+        // so conflict checks are one set lookup instead of a scan over
+        // every group
+        this.forbiddenPairs = new Map();
+        this.cannotSitTogether.forEach(group => {
+            group.forEach(student => {
+                let partners = this.forbiddenPairs.get(student);
+                if (!partners) {
+                    partners = new Set();
+                    this.forbiddenPairs.set(student, partners);
+                }
+                group.forEach(other => {
+                    if (other !== student) partners.add(other);
+                });
+            });
+        });
+
         // Parse row/column requirements
         this.rowRequirements = new Map();
         if (this.constraints.row_requirements) {
@@ -53,8 +70,174 @@ class SeatingChartGenerator {
             });
         }
 
+        // Per-desk caches: capacity and neighbor lists never change after
+        // construction but are consulted constantly in the placement loops,
+        // so resolve the override map and bounds checks once here.
+        // Hot-path state is kept as flat arrays indexed by r * columns + c.
+        const cells = this.rows * this.columns;
+        this.capMaxFlat = new Float64Array(cells);
+        this.blockedMask = new Uint8Array(cells);
+        // Neighbor indices as a flat Int32Array of 4 slots per desk
+        // (up/down/left/right), -1 where the grid edge cuts one off -
+        // fixed-stride typed reads, no nested arrays on the hot path
+        this.neighborIdxFlat = new Int32Array(cells * 4).fill(-1);
+        this.neighborList = [];
+        for (let r = 0; r < this.rows; r++) {
+            this.neighborList[r] = [];
+            for (let c = 0; c < this.columns; c++) {
+                const key = `${r},${c}`;
+                this.capMaxFlat[r * this.columns + c] = this.deskCapacityOverrides.has(key)
+                    ? this.deskCapacityOverrides.get(key)
+                    : this.defaultMaxCapacity;
+                if (this.blockedDesks.has(key)) {
+                    this.blockedMask[r * this.columns + c] = 1;
+                }
+
+                const neighbors = [];
+                if (r > 0) neighbors.push([r - 1, c]);
+                if (r < this.rows - 1) neighbors.push([r + 1, c]);
+                if (c > 0) neighbors.push([r, c - 1]);
+                if (c < this.columns - 1) neighbors.push([r, c + 1]);
+                this.neighborList[r][c] = neighbors;
+                neighbors.forEach(([nr, nc], k) => {
+                    this.neighborIdxFlat[(r * this.columns + c) * 4 + k] =
+                        nr * this.columns + nc;
+                });
+            }
+        }
+
+        // Random source for the current attempt; generate() swaps in a
+        // seeded stream when the caller provides a seed
+        this._rng = Math.random;
+
+        // Nogood learning: sets of placements proven unextendable are
+        // remembered (as canonical keys) so the search never re-explores
+        // an equivalent partial assignment reached in a different order.
+        // Nogoods depend only on the constraints, so they stay valid
+        // across attempts. The stack tracks the current placements as
+        // packed (sid, desk) codes for cheap key construction.
+        this._nogoods = new Set();
+        this._placementStack = [];
+
         // Validate inputs
         this._validate();
+
+        // Integer student ids: the search runs entirely on small ints
+        // (cheap hashing, direct array indexing); names reappear only
+        // at the grid boundary in _toGrid
+        this.nameToId = new Map();
+        this.students.forEach((name, sid) => this.nameToId.set(name, sid));
+        this.idToName = this.students;
+
+        // Per-student capacity weight, resolved once - the placement
+        // kernel then works on plain numbers instead of re-probing the
+        // largeStudents set on every check, which keeps it on the
+        // engine's optimized numeric path
+        this.studentWeight = new Float64Array(this.students.length);
+        this.students.forEach((student, sid) => {
+            this.studentWeight[sid] = this.largeStudents.has(student) ? 1.5 : 1;
+        });
+
+        // forbiddenPairs in id space for the solver (names listed in a
+        // group but missing from the roster are dropped here)
+        this.forbiddenIds = new Array(this.students.length).fill(null);
+        this.students.forEach((student, sid) => {
+            const partners = this.forbiddenPairs.get(student);
+            if (!partners) return;
+            const ids = [];
+            partners.forEach(partner => {
+                if (this.nameToId.has(partner)) {
+                    ids.push(this.nameToId.get(partner));
+                }
+            });
+            if (ids.length > 0) {
+                this.forbiddenIds[sid] = ids;
+            }
+        });
+
+        // Conflict groups as bitmasks: each cannot_sit_together group
+        // gets one bit, and each student a mask of the groups they
+        // belong to. Two students conflict exactly when their masks
+        // intersect, so the desk-level check collapses to a single AND.
+        // JS bitwise ops are 32-bit wide, so with more than 32 groups
+        // the masks stay zero and the forbidden-count maps carry the
+        // full load as before.
+        this._useGroupMasks = this.cannotSitTogether.length <= 32;
+        this.groupMaskOf = new Int32Array(this.students.length);
+        if (this._useGroupMasks) {
+            this.cannotSitTogether.forEach((group, g) => {
+                group.forEach(name => {
+                    if (this.nameToId.has(name)) {
+                        this.groupMaskOf[this.nameToId.get(name)] |= 1 << g;
+                    }
+                });
+            });
+        }
+
+        // Per-student "any conflict partners at all?" flag - lets the
+        // desk check stop after the capacity test for the (usually
+        // majority of) students with no separation constraints
+        this._hasConflict = new Uint8Array(this.students.length);
+        this.students.forEach((student, sid) => {
+            if (this.forbiddenIds[sid] !== null) {
+                this._hasConflict[sid] = 1;
+            }
+        });
+
+        // Which students have domains worth tracking for MRV selection:
+        // anyone in a conflict group or with a row/column requirement
+        this._constrained = new Uint8Array(this.students.length);
+        this.students.forEach((student, sid) => {
+            if (this.forbiddenIds[sid] !== null || this._constraintScore(student) > 0) {
+                this._constrained[sid] = 1;
+            }
+        });
+
+        // Bucket student ids by constraint score, most constrained first.
+        // The tiers never change, so generate() only has to shuffle
+        // within each tier rather than sort the whole roster per attempt.
+        const tiersByScore = new Map();
+        this.students.forEach((student, sid) => {
+            const score = this._constraintScore(student);
+            if (!tiersByScore.has(score)) {
+                tiersByScore.set(score, []);
+            }
+            tiersByScore.get(score).push(sid);
+        });
+        this._studentTiers = [...tiersByScore.keys()]
+            .sort((a, b) => b - a)
+            .map(score => tiersByScore.get(score));
+
+        // All non-blocked desk positions as flat indices, computed once -
+        // the placement loop works on plain ints, never [r, c] pairs
+        this.validPositions = [];
+        for (let idx = 0; idx < cells; idx++) {
+            if (!this.blockedMask[idx]) {
+                this.validPositions.push(idx);
+            }
+        }
+
+        // Precompute each student's legal desks, indexed by student id
+        // (row/column requirements and blocked desks never change, so
+        // filter them once here instead of rejecting positions inside
+        // the placement loop). Unconstrained students share the
+        // validPositions array; the search never mutates it, so sharing
+        // is safe.
+        this.allowedDesks = new Array(this.students.length);
+        this.students.forEach((student, sid) => {
+            const requiredRow = this.rowRequirements.has(student)
+                ? this.rowRequirements.get(student) - 1 : null;
+            const requiredCol = this.columnRequirements.has(student)
+                ? this.columnRequirements.get(student) - 1 : null;
+            if (requiredRow === null && requiredCol === null) {
+                this.allowedDesks[sid] = this.validPositions;
+                return;
+            }
+            this.allowedDesks[sid] = this.validPositions.filter(idx =>
+                (requiredRow === null || Math.floor(idx / this.columns) === requiredRow) &&
+                (requiredCol === null || idx % this.columns === requiredCol)
+            );
+        });
     }
 
     _validate() {
@@ -98,43 +281,130 @@ class SeatingChartGenerator {
                 );
             }
         });
+
+        // Detect requirement combinations that can never be satisfied,
+        // so a mis-specified file fails immediately with a message that
+        // names the conflict instead of exhausting the search first.
+
+        // Students pinned to a single desk by a row + column requirement
+        const pinned = new Map(); // desk key -> students pinned there
+        this.rowRequirements.forEach((row, student) => {
+            if (!this.columnRequirements.has(student)) return;
+            const col = this.columnRequirements.get(student);
+            const key = `${row - 1},${col - 1}`;
+            if (this.blockedDesks.has(key)) {
+                throw new Error(
+                    `Student ${student} requires row ${row}, column ${col}, but that desk is blocked`
+                );
+            }
+            if (!pinned.has(key)) pinned.set(key, []);
+            pinned.get(key).push(student);
+        });
+
+        pinned.forEach((students, key) => {
+            const [row, col] = key.split(',').map(Number);
+            let weight = 0;
+            for (let i = 0; i < students.length; i++) {
+                const student = students[i];
+                weight += this.largeStudents.has(student) ? 1.5 : 1;
+                // Forbidden pairs are symmetric, so each pair only needs
+                // to be checked in one order
+                for (let j = i + 1; j < students.length; j++) {
+                    const other = students[j];
+                    if (this._areForbidden(student, other)) {
+                        throw new Error(
+                            `Students ${student} and ${other} cannot sit together, but both ` +
+                            `are required to be at row ${row + 1}, column ${col + 1}`
+                        );
+                    }
+                }
+            }
+            if (weight > this._getDeskMaxCapacity(row, col)) {
+                throw new Error(
+                    `Students required at row ${row + 1}, column ${col + 1} ` +
+                    `(${students.join(', ')}) exceed that desk's capacity`
+                );
+            }
+        });
+
+        // Conflict-group members forced into the same row (or column)
+        // need mutually non-adjacent desks there
+        for (const group of this.cannotSitTogether) {
+            this._checkSeparationFits(group, this.rowRequirements, 'row');
+            this._checkSeparationFits(group, this.columnRequirements, 'column');
+        }
     }
 
-    _getDeskMaxCapacity(row, col) {
-        const key = `${row},${col}`;
-        if (this.deskCapacityOverrides.has(key)) {
-            return this.deskCapacityOverrides.get(key);
+    _areForbidden(studentA, studentB) {
+        const partners = this.forbiddenPairs.get(studentA);
+        return partners !== undefined && partners.has(studentB);
+    }
+
+    /**
+     * If several members of a cannot_sit_together group are required to
+     * be in the same row (or column), they need pairwise non-adjacent
+     * desks there; throw if that line cannot physically separate them.
+     */
+    _checkSeparationFits(group, requirements, kind) {
+        const byLine = new Map();
+        for (const student of group) {
+            if (!requirements.has(student)) continue;
+            const line = requirements.get(student);
+            if (!byLine.has(line)) byLine.set(line, []);
+            byLine.get(line).push(student);
         }
-        return this.defaultMaxCapacity;
+        byLine.forEach((students, line) => {
+            if (students.length < 2) return;
+            if (students.length > this._maxSeparatedDesks(line - 1, kind)) {
+                throw new Error(
+                    `Students ${students.join(', ')} cannot sit together, but ${kind} ${line} ` +
+                    `has too few non-adjacent desks to separate them`
+                );
+            }
+        });
+    }
+
+    /**
+     * Maximum number of mutually non-adjacent, non-blocked desks in one
+     * row or column (greedy scan; optimal on a line of desks).
+     */
+    _maxSeparatedDesks(line, kind) {
+        const length = kind === 'row' ? this.columns : this.rows;
+        let count = 0;
+        let prevTaken = false;
+        for (let i = 0; i < length; i++) {
+            const idx = kind === 'row'
+                ? line * this.columns + i
+                : i * this.columns + line;
+            if (!this.blockedMask[idx] && !prevTaken) {
+                count++;
+                prevTaken = true;
+            } else {
+                prevTaken = false;
+            }
+        }
+        return count;
+    }
+
+    _getDeskMaxCapacity(row, col) {
+        return this.capMaxFlat[row * this.columns + col];
     }
 
     _getNeighbors(row, col) {
-        const neighbors = [];
-        // Up
-        if (row > 0) neighbors.push([row - 1, col]);
-        // Down
-        if (row < this.rows - 1) neighbors.push([row + 1, col]);
-        // Left
-        if (col > 0) neighbors.push([row, col - 1]);
-        // Right
-        if (col < this.columns - 1) neighbors.push([row, col + 1]);
-        return neighbors;
+        return this.neighborList[row][col];
     }
 
     _getStudentsAtDesk(seating, row, col) {
         const desk = seating[row][col];
-        return desk === "BLOCKED" ? [] : desk;
-    }
-
-    _getStudentsAtAdjacentDesks(seating, row, col) {
-        const students = new Set();
-        this._getNeighbors(row, col).forEach(([neighborRow, neighborCol]) => {
-            const deskStudents = this._getStudentsAtDesk(seating, neighborRow, neighborCol);
-            deskStudents.forEach(student => students.add(student));
-        });
-        return students;
+        return Array.isArray(desk) ? desk : [];
     }
 
+    /**
+     * Full constraint check for an arbitrary seating grid. This is the
+     * reference implementation, kept for standalone validation; the
+     * search itself uses the incremental fast path (_deskAllows), so
+     * don't bother optimizing this one.
+     */
     _checkConstraints(seating, student, row, col) {
         // Check row requirements
         if (this.rowRequirements.has(student)) {
@@ -170,21 +440,21 @@ class SeatingChartGenerator {
             return false;
         }
 
-        // Check cannot sit together constraints - same desk
-        for (const deskStudent of currentDeskStudents) {
-            for (const group of this.cannotSitTogether) {
-                if (group.includes(student) && group.includes(deskStudent)) {
+        // Check cannot sit together constraints - same desk, then adjacent
+        // (scan neighbor desks directly; no intermediate set needed)
+        const forbidden = this.forbiddenPairs.get(student);
+        if (forbidden) {
+            for (const deskStudent of currentDeskStudents) {
+                if (forbidden.has(deskStudent)) {
                     return false;
                 }
             }
-        }
 
-        // Check cannot sit together constraints - adjacent desks
-        const adjacentStudents = this._getStudentsAtAdjacentDesks(seating, row, col);
-        for (const adjacentStudent of adjacentStudents) {
-            for (const group of this.cannotSitTogether) {
-                if (group.includes(student) && group.includes(adjacentStudent)) {
-                    return false;
+            for (const [neighborRow, neighborCol] of this._getNeighbors(row, col)) {
+                for (const neighborStudent of this._getStudentsAtDesk(seating, neighborRow, neighborCol)) {
+                    if (forbidden.has(neighborStudent)) {
+                        return false;
+                    }
                 }
             }
         }
@@ -193,82 +463,456 @@ class SeatingChartGenerator {
     }
 
     generate(maxAttempts = 1000, seed = null) {
-        // Set random seed if provided
-        if (seed !== null) {
-            this._seed = seed;
-            this._seededRandom = this._createSeededRandom(seed);
-        } else {
-            this._seededRandom = null;
+        // Each attempt runs a depth-first backtracking search with a fresh
+        // random student order. Backtracking undoes individual placements
+        // instead of restarting from scratch, so a single attempt explores
+        // the whole search space unless the node budget runs out first.
+        const cells = this.rows * this.columns;
+
+        // Flat per-desk search state (structure-of-arrays): student
+        // lists, running capacity weight, and conflict masks. Allocated
+        // once on the first call and reset in place per attempt, so a
+        // long run of attempts costs O(cells) fills instead of fresh
+        // array allocations every time.
+        if (!this._deskStudents) {
+            this._deskStudents = new Array(cells);
+            for (let idx = 0; idx < cells; idx++) {
+                this._deskStudents[idx] = [];
+            }
+            this._deskWeight = new Float64Array(cells);
+            this._deskGroupMask = new Int32Array(cells);
+            this._zoneGroupMask = new Int32Array(cells);
+            // The forbidden-count table only backs the >32-group
+            // fallback; skip allocating it on the mask path
+            this._forbiddenAt = this._useGroupMasks ? null : new Array(cells);
+            this._placed = new Uint8Array(this.students.length);
         }
 
         for (let attempt = 0; attempt < maxAttempts; attempt++) {
-            // Initialize empty seating chart - each desk holds a list of students
-            const seating = [];
-            for (let r = 0; r < this.rows; r++) {
-                seating[r] = [];
-                for (let c = 0; c < this.columns; c++) {
-                    seating[r][c] = [];
-                }
+            // Each attempt gets its own RNG stream derived from
+            // (seed, attempt), so a given attempt is reproducible no
+            // matter how much randomness earlier attempts consumed
+            this._rng = seed !== null ? this._createSeededRandom(seed + attempt) : Math.random;
+
+            for (let idx = 0; idx < cells; idx++) {
+                this._deskStudents[idx].length = 0;
+            }
+            this._deskWeight.fill(0);
+            this._deskGroupMask.fill(0);
+            this._zoneGroupMask.fill(0);
+            if (this._forbiddenAt) {
+                this._forbiddenAt.fill(null);
+            }
+            this._placed.fill(0);
+            this._placementStack.length = 0;
+
+            // Order students most-constrained-first (MRV heuristic):
+            // students locked to a row and/or column have the fewest legal
+            // desks, then large students, then everyone else. The tiers
+            // are precomputed; only the order within each tier is
+            // re-randomized per attempt - no sort needed.
+            const shuffledStudents = [];
+            for (const tier of this._studentTiers) {
+                const shuffledTier = [...tier];
+                this._shuffle(shuffledTier);
+                shuffledStudents.push(...shuffledTier);
             }
 
-            // Mark blocked desks as unavailable
-            this.blockedDesks.forEach(key => {
-                const [row, col] = key.split(',').map(Number);
-                seating[row][col] = "BLOCKED";
-            });
+            // Node budget keeps one unlucky ordering from stalling the UI;
+            // exhausting it triggers a randomized restart instead.
+            this._searchBudget = Math.max(10000, this.students.length * this.rows * this.columns * 10);
 
-            // Shuffle students for random placement
-            const shuffledStudents = [...this.students];
-            this._shuffle(shuffledStudents);
-
-            // Try to place each student
-            let success = true;
-            for (const student of shuffledStudents) {
-                let placed = false;
-
-                // Get all available desk positions
-                const positions = [];
-                for (let r = 0; r < this.rows; r++) {
-                    for (let c = 0; c < this.columns; c++) {
-                        if (seating[r][c] !== "BLOCKED") {
-                            positions.push([r, c]);
-                        }
-                    }
+            if (this._backtrack(shuffledStudents, 0)) {
+                return this._toGrid();
+            }
+
+            if (this._searchBudget > 0) {
+                // The search space was fully explored without finding a
+                // valid arrangement - more attempts cannot help.
+                throw new Error(
+                    `Could not generate a valid seating chart. ` +
+                    `Constraints are too restrictive - no valid arrangement exists.`
+                );
+            }
+        }
+
+        throw new Error(
+            `Could not generate a valid seating chart after ${maxAttempts} attempts. ` +
+            `Constraints may be too restrictive.`
+        );
+    }
+
+    /**
+     * Score how constrained a student is for placement ordering.
+     * Row/column requirements weigh heaviest (fewest legal desks),
+     * large students next (fewest desks with room left).
+     */
+    _constraintScore(student) {
+        let score = 0;
+        if (this.rowRequirements.has(student)) score += 2;
+        if (this.columnRequirements.has(student)) score += 2;
+        if (this.largeStudents.has(student)) score += 1;
+        return score;
+    }
+
+    /**
+     * Recursively place students[index..] onto the flat search state,
+     * backtracking (undoing the last placement) when a student cannot
+     * be placed. Returns true if every remaining student was placed.
+     */
+    _backtrack(students, index) {
+        if (index === students.length) {
+            return true;
+        }
+        if (--this._searchBudget <= 0) {
+            return false;
+        }
+
+        // Skip subtrees rooted at a set of placements already proven
+        // unextendable via some other student ordering
+        const nogoodKey = index > 0 ? this._placementKey() : null;
+        if (nogoodKey !== null && this._nogoods.has(nogoodKey)) {
+            return false;
+        }
+
+        // Dynamic MRV: among the remaining constrained students, pull
+        // forward the one with the fewest currently feasible desks.
+        // Returns false when someone's domain is already empty, which
+        // prunes the branch before a single further placement.
+        if (!this._selectMostConstrained(students, index)) {
+            return this._recordNogood(nogoodKey);
+        }
+        const sid = students[index];
+        const candidates = this.allowedDesks[sid];
+
+        // Students pinned to one desk by a row + column requirement
+        // have nothing to order - try their desk directly
+        if (candidates.length === 1) {
+            const idx = candidates[0];
+            if (this._deskAllows(sid, idx)) {
+                this._place(sid, idx);
+                if (this._partnersStillPlaceable(sid)
+                        && this._backtrack(students, index + 1)) {
+                    return true;
                 }
+                this._unplace(sid, idx);
+            }
+            return this._recordNogood(nogoodKey);
+        }
 
-                // Strategy: Even distribution - always prefer desks with fewest students
-                // Shuffle first for randomness among equal desks
-                this._shuffle(positions);
+        // Candidate desks: the student's precomputed legal desks
+        // (row/column requirements and blocked desks already filtered out).
+        // Strategy: Even distribution - always prefer desks with fewest
+        // students, with a random tiebreak among equally full desks.
+        // A lazily popped min-heap replaces the old shuffle + full sort:
+        // heapify is O(n) and we only pay O(log n) per desk actually
+        // inspected, which is usually just the first one. The heap is a
+        // flat [key, idx, key, idx, ...] array: occupancy (integer) plus
+        // the random tiebreak (< 1) pack into a single float key, so an
+        // entry is two numbers and nothing per-entry is allocated.
+        // Feasibility is checked once while building the heap rather
+        // than on every pop: backtracking restores the desk state
+        // exactly, so a desk that was feasible when the heap was built
+        // is still feasible when its turn comes around. The minimum is
+        // tracked during the same scan, so the common easy case - the
+        // first desk works and the search never returns here - pays
+        // nothing for heap ordering; the heap is only put in order if
+        // the first candidate's subtree fails.
+        const heap = [];
+        let bestKey = Infinity;
+        let bestPos = -1;
+        for (const idx of candidates) {
+            if (this._deskAllows(sid, idx)) {
+                const key = this._deskStudents[idx].length + this._rng();
+                if (key < bestKey) {
+                    bestKey = key;
+                    bestPos = heap.length;
+                }
+                heap.push(key, idx);
+            }
+        }
+        if (bestPos === -1) {
+            return this._recordNogood(nogoodKey);
+        }
 
-                // Sort by number of students (fewest first)
-                positions.sort((a, b) => {
-                    return seating[a[0]][a[1]].length - seating[b[0]][b[1]].length;
-                });
+        const firstIdx = heap[bestPos + 1];
+        this._place(sid, firstIdx);
+        // Fail fast: if this placement just locked out an unplaced
+        // conflict partner entirely, don't bother recursing - this
+        // branch can never succeed
+        if (this._partnersStillPlaceable(sid)
+                && this._backtrack(students, index + 1)) {
+            return true;
+        }
+        this._unplace(sid, firstIdx);
+        if (this._searchBudget <= 0) {
+            return false;
+        }
 
-                // Try to place student in a valid position
-                for (const [row, col] of positions) {
-                    if (this._checkConstraints(seating, student, row, col)) {
-                        seating[row][col].push(student);
-                        placed = true;
-                        break;
-                    }
+        // Hard case: remove the tried candidate, order the rest, and
+        // enumerate them cheapest-first
+        heap[bestPos] = heap[heap.length - 2];
+        heap[bestPos + 1] = heap[heap.length - 1];
+        heap.length -= 2;
+        this._heapify(heap);
+
+        while (heap.length > 0) {
+            const idx = this._heapPop(heap);
+            this._place(sid, idx);
+            if (this._partnersStillPlaceable(sid)
+                    && this._backtrack(students, index + 1)) {
+                return true;
+            }
+            this._unplace(sid, idx);
+            if (this._searchBudget <= 0) {
+                return false;
+            }
+        }
+
+        return this._recordNogood(nogoodKey);
+    }
+
+    // Canonical key for the current set of placements: order-independent,
+    // so the same partial assignment reached via different orderings
+    // maps to the same nogood entry
+    _placementKey() {
+        return this._placementStack.slice().sort((a, b) => a - b).join(',');
+    }
+
+    /**
+     * Record the current placements as a nogood and fail the branch.
+     * Only exhaustive failures qualify - a subtree abandoned because
+     * the node budget ran out might still contain a solution. The set
+     * is bounded; when full it is simply cleared.
+     */
+    _recordNogood(nogoodKey) {
+        if (nogoodKey !== null && this._searchBudget > 0) {
+            if (this._nogoods.size >= 10000) {
+                this._nogoods.clear();
+            }
+            this._nogoods.add(nogoodKey);
+        }
+        return false;
+    }
+
+    /**
+     * Minimum-remaining-values selection: swap the unplaced constrained
+     * student with the smallest live domain into position index.
+     * Unconstrained students' domains only shrink via capacity, so they
+     * are left in their randomized tier order. Returns false if some
+     * constrained student has no feasible desk at all.
+     */
+    _selectMostConstrained(students, index) {
+        let best = -1;
+        let bestSize = Infinity;
+        for (let i = index; i < students.length; i++) {
+            const sid = students[i];
+            if (!this._constrained[sid]) continue;
+            let size = 0;
+            for (const idx of this.allowedDesks[sid]) {
+                if (this._deskAllows(sid, idx) && ++size >= bestSize) {
+                    break; // already no better than the current best
                 }
+            }
+            if (size === 0) {
+                return false;
+            }
+            if (size < bestSize) {
+                best = i;
+                bestSize = size;
+            }
+        }
+        if (best > index) {
+            const tmp = students[index];
+            students[index] = students[best];
+            students[best] = tmp;
+        }
+        return true;
+    }
 
-                if (!placed) {
-                    success = false;
+    /**
+     * After placing a student, confirm each of their still-unplaced
+     * cannot_sit_together partners has at least one feasible desk left.
+     * Detecting a locked-out partner here prunes the whole subtree
+     * instead of discovering the dead end many placements later.
+     */
+    _partnersStillPlaceable(sid) {
+        const partners = this.forbiddenIds[sid];
+        if (!partners) {
+            return true;
+        }
+        for (const partner of partners) {
+            if (this._placed[partner]) continue;
+            let placeable = false;
+            for (const deskIdx of this.allowedDesks[partner]) {
+                if (this._deskAllows(partner, deskIdx)) {
+                    placeable = true;
                     break;
                 }
             }
+            if (!placeable) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    /**
+     * The entire per-desk feasibility check for the search, a handful
+     * of integer/float ops ordered cheapest-first. Row/column
+     * requirements and blocked desks are already encoded in
+     * allowedDesks, so nothing here re-derives them.
+     */
+    _deskAllows(sid, idx) {
+        // Cheapest first: capacity is one load + add + compare
+        // (large students count as 1.5 towards max)
+        if (this._deskWeight[idx] + this.studentWeight[sid] > this.capMaxFlat[idx]) {
+            return false;
+        }
+
+        // Students with no conflict partners are done: capacity is
+        // their only constraint here
+        if (!this._hasConflict[sid]) {
+            return true;
+        }
 
-            if (success) {
-                return seating;
+        // Conflict check: the zone mask already holds the OR of the
+        // group masks of this desk and its neighbors, so the whole
+        // same-or-adjacent-desk test is one load and one AND
+        if ((this._zoneGroupMask[idx] & this.groupMaskOf[sid]) !== 0) {
+            return false;
+        }
+
+        // Fallback for >32 conflict groups: the incrementally maintained
+        // forbidden-count map covers this desk and its neighbors
+        if (!this._useGroupMasks) {
+            const forbidden = this._forbiddenAt[idx];
+            if (forbidden && forbidden.has(sid)) {
+                return false;
             }
         }
 
-        throw new Error(
-            `Could not generate a valid seating chart after ${maxAttempts} attempts. ` +
-            `Constraints may be too restrictive.`
-        );
+        return true;
+    }
+
+    /**
+     * Place a student and propagate: every cannot_sit_together partner
+     * becomes forbidden at this desk and its neighbors. Counts (not
+     * plain sets) so overlapping placements unwind correctly.
+     */
+    _place(sid, idx) {
+        this._placementStack.push(sid * this.capMaxFlat.length + idx);
+        this._deskStudents[idx].push(sid);
+        this._deskWeight[idx] += this.studentWeight[sid];
+        const groupMask = this.groupMaskOf[sid];
+        if (groupMask !== 0) {
+            this._deskGroupMask[idx] |= groupMask;
+            // The student's groups now forbid this desk and its neighbors
+            this._zoneGroupMask[idx] |= groupMask;
+            const base = idx * 4;
+            for (let k = 0; k < 4; k++) {
+                const neighbor = this.neighborIdxFlat[base + k];
+                if (neighbor >= 0) {
+                    this._zoneGroupMask[neighbor] |= groupMask;
+                }
+            }
+        }
+        this._placed[sid] = 1;
+        if (!this._useGroupMasks) {
+            this._updateForbidden(sid, idx, +1);
+        }
+    }
+
+    _unplace(sid, idx) {
+        this._placementStack.pop();
+        this._deskStudents[idx].pop();
+        this._deskWeight[idx] -= this.studentWeight[sid];
+        if (this.groupMaskOf[sid] !== 0) {
+            // Desk-mates and neighbors may contribute the same group
+            // bits, so rebuild the affected masks from the desks rather
+            // than XOR-ing bits out
+            let mask = 0;
+            for (const other of this._deskStudents[idx]) {
+                mask |= this.groupMaskOf[other];
+            }
+            this._deskGroupMask[idx] = mask;
+            this._refreshZone(idx);
+            const base = idx * 4;
+            for (let k = 0; k < 4; k++) {
+                const neighbor = this.neighborIdxFlat[base + k];
+                if (neighbor >= 0) {
+                    this._refreshZone(neighbor);
+                }
+            }
+        }
+        this._placed[sid] = 0;
+        if (!this._useGroupMasks) {
+            this._updateForbidden(sid, idx, -1);
+        }
+    }
+
+    // Recompute a desk's zone mask (its own group mask OR its neighbors')
+    _refreshZone(idx) {
+        let mask = this._deskGroupMask[idx];
+        const base = idx * 4;
+        for (let k = 0; k < 4; k++) {
+            const neighbor = this.neighborIdxFlat[base + k];
+            if (neighbor >= 0) {
+                mask |= this._deskGroupMask[neighbor];
+            }
+        }
+        this._zoneGroupMask[idx] = mask;
+    }
+
+    _updateForbidden(sid, deskIdx, delta) {
+        const partners = this.forbiddenIds[sid];
+        if (!partners) {
+            return;
+        }
+
+        const idxs = [deskIdx];
+        for (let k = 0; k < 4; k++) {
+            const neighbor = this.neighborIdxFlat[deskIdx * 4 + k];
+            if (neighbor >= 0) {
+                idxs.push(neighbor);
+            }
+        }
+
+        for (const partner of partners) {
+            for (const idx of idxs) {
+                let counts = this._forbiddenAt[idx];
+                if (!counts) {
+                    counts = new Map();
+                    this._forbiddenAt[idx] = counts;
+                }
+                const next = (counts.get(partner) || 0) + delta;
+                if (next > 0) {
+                    counts.set(partner, next);
+                } else {
+                    counts.delete(partner);
+                }
+            }
+        }
+    }
+
+    /**
+     * Convert the flat search state back into the row/column grid the
+     * callers and renderer expect, mapping student ids back to names.
+     * Blocked desks are null; everything else is a (possibly empty)
+     * array of student names.
+     */
+    _toGrid() {
+        const seating = [];
+        for (let r = 0; r < this.rows; r++) {
+            seating[r] = [];
+            for (let c = 0; c < this.columns; c++) {
+                const idx = r * this.columns + c;
+                seating[r][c] = this.blockedMask[idx]
+                    ? null
+                    : this._deskStudents[idx].map(sid => this.idToName[sid]);
+            }
+        }
+        return seating;
     }
 
     // Seeded random for reproducibility
@@ -279,19 +923,52 @@ class SeatingChartGenerator {
         };
     }
 
+    // Binary min-heap over a flat [key, value, key, value, ...] array;
+    // entry i lives at offsets 2i (key) and 2i + 1 (value)
+
+    _heapify(heap) {
+        for (let i = (heap.length >> 2) - 1; i >= 0; i--) {
+            this._siftDown(heap, i);
+        }
+    }
+
+    // Remove and return the value of the smallest-key entry
+    _heapPop(heap) {
+        const value = heap[1];
+        const lastValue = heap.pop();
+        const lastKey = heap.pop();
+        if (heap.length > 0) {
+            heap[0] = lastKey;
+            heap[1] = lastValue;
+            this._siftDown(heap, 0);
+        }
+        return value;
+    }
+
+    _siftDown(heap, i) {
+        const n = heap.length >> 1;
+        while (true) {
+            let smallest = i;
+            const left = 2 * i + 1;
+            const right = left + 1;
+            if (left < n && heap[2 * left] < heap[2 * smallest]) smallest = left;
+            if (right < n && heap[2 * right] < heap[2 * smallest]) smallest = right;
+            if (smallest === i) break;
+            let tmp = heap[2 * i];
+            heap[2 * i] = heap[2 * smallest];
+            heap[2 * smallest] = tmp;
+            tmp = heap[2 * i + 1];
+            heap[2 * i + 1] = heap[2 * smallest + 1];
+            heap[2 * smallest + 1] = tmp;
+            i = smallest;
+        }
+    }
+
+    // Fisher-Yates shuffle using the current attempt's RNG
     _shuffle(array) {
-        if (this._seededRandom) {
-            // Fisher-Yates shuffle with seeded random
-            for (let i = array.length - 1; i > 0; i--) {
-                const j = Math.floor(this._seededRandom() * (i + 1));
-                [array[i], array[j]] = [array[j], array[i]];
-            }
-        } else {
-            // Standard Fisher-Yates shuffle
-            for (let i = array.length - 1; i > 0; i--) {
-                const j = Math.floor(Math.random() * (i + 1));
-                [array[i], array[j]] = [array[j], array[i]];
-            }
+        for (let i = array.length - 1; i > 0; i--) {
+            const j = Math.floor(this._rng() * (i + 1));
+            [array[i], array[j]] = [array[j], array[i]];
         }
     }
 }
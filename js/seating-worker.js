@@ -0,0 +1,19 @@
+/**
+ * Seating Chart Web Worker
+ * Runs seating chart generation off the main thread so the UI stays
+ * responsive while the search runs. All data stays in the browser.
+ */
+
+importScripts('seating-generator.js');
+
+self.onmessage = (event) => {
+    const { classroomConfig, studentsConfig, seed } = event.data;
+
+    try {
+        const generator = new SeatingChartGenerator(classroomConfig, studentsConfig);
+        const seating = generator.generate(1000, seed);
+        self.postMessage({ seating });
+    } catch (error) {
+        self.postMessage({ error: error.message });
+    }
+};
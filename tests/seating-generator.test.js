@@ -31,6 +31,68 @@ describe('SeatingChartGenerator', () => {
       }).toThrow('out of bounds');
     });
 
+    test('should reject a row+column requirement pointing at a blocked desk', () => {
+      const classroom = {
+        rows: 3,
+        columns: 3,
+        max_capacity: 3.0,
+        blocked_desks: [{ row: 2, column: 2 }]
+      };
+      const students = {
+        students: ['Alice', 'Bob'],
+        constraints: {
+          row_requirements: [{ student: 'Alice', row: 2 }],
+          column_requirements: [{ student: 'Alice', column: 2 }]
+        }
+      };
+
+      expect(() => {
+        new SeatingChartGenerator(classroom, students);
+      }).toThrow('blocked');
+    });
+
+    test('should reject conflicting students pinned to the same desk', () => {
+      const classroom = { rows: 3, columns: 3, max_capacity: 3.0 };
+      const students = {
+        students: ['Alice', 'Bob'],
+        constraints: {
+          cannot_sit_together: [['Alice', 'Bob']],
+          row_requirements: [
+            { student: 'Alice', row: 1 },
+            { student: 'Bob', row: 1 }
+          ],
+          column_requirements: [
+            { student: 'Alice', column: 1 },
+            { student: 'Bob', column: 1 }
+          ]
+        }
+      };
+
+      expect(() => {
+        new SeatingChartGenerator(classroom, students);
+      }).toThrow('cannot sit together');
+    });
+
+    test('should reject separation groups that cannot fit in a required row', () => {
+      const classroom = { rows: 2, columns: 3, max_capacity: 3.0 };
+      const students = {
+        students: ['Alice', 'Bob', 'Charlie'],
+        constraints: {
+          cannot_sit_together: [['Alice', 'Bob', 'Charlie']],
+          row_requirements: [
+            { student: 'Alice', row: 1 },
+            { student: 'Bob', row: 1 },
+            { student: 'Charlie', row: 1 }
+          ]
+        }
+      };
+
+      // Row 1 has 3 desks but only 2 can be mutually non-adjacent
+      expect(() => {
+        new SeatingChartGenerator(classroom, students);
+      }).toThrow('too few non-adjacent desks');
+    });
+
     test('should validate column requirements are within bounds', () => {
       const classroom = { rows: 3, columns: 3, max_capacity: 3.0 };
       const students = {